@@ -13,6 +13,7 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import DOMAIN
 from .coordinator import EvoCarShareUpdateCoordinator
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__).setLevel(logging.DEBUG)
 
@@ -23,24 +24,50 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hello World from a config entry."""
 
     # Track the config entry to determine if the Coordinator can be unloaded
-    hass.data.setdefault(DOMAIN, {"config": {}})
+    hass.data.setdefault(DOMAIN, {"config": {}, "reloading": set()})
 
     if "coordinator" not in hass.data[DOMAIN]:
         websession = async_get_clientsession(hass)
         hass.data[DOMAIN]["coordinator"] = EvoCarShareUpdateCoordinator(
             hass, websession
         )
+        async_setup_services(hass)
 
     hass.data[DOMAIN]["config"][entry.entry_id] = entry
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # The current snapshot has no ranking for this entry yet
+    await hass.data[DOMAIN]["coordinator"].async_request_refresh()
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change.
+
+    The Coordinator, and with it the position history and any running profile,
+    is kept while the entry reloads.
+    """
+    reloading = hass.data[DOMAIN]["reloading"]
+    reloading.add(entry.entry_id)
+    try:
+        await hass.config_entries.async_reload(entry.entry_id)
+    finally:
+        reloading.discard(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    # A reloading entry is set up again straight away, keep it tracked
+    if entry.entry_id in hass.data[DOMAIN]["reloading"]:
+        return unload_ok
+
+    if unload_ok:
         hass.data[DOMAIN]["config"].pop(entry.entry_id)
 
     # If this is the last config entry also unload the Coordinator
@@ -49,5 +76,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "no configurations remaining - removing EvoCarShareUpdateCoordinator"
         )
         hass.data[DOMAIN].pop("coordinator")
+        async_unload_services(hass)
 
     return unload_ok
@@ -7,10 +7,11 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries, exceptions
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 
 from .const import (
+    CONF_MIN_FUEL,
     CONF_RADIUS,
     CONF_SEARCH_MODE,
     CONF_SEARCH_VALUE,
@@ -20,7 +21,7 @@ from .const import (
     SEARCH_MODE_COUNT,
     SEARCH_MODE_RADIUS,
 )
-from .helpers import get_zone_by_name, get_zone_config
+from .helpers import get_min_fuel, get_radii, get_zone_by_name, get_zone_config
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,22 +31,49 @@ def generate_data_schema(zone_list: list[str]):
         vol.Required(
             CONF_ZONE,
         ): vol.In(zone_list),
-        (CONF_RADIUS): int,
+        (CONF_RADIUS): str,
+        vol.Optional(CONF_MIN_FUEL, default=0): int,
     })
 
 
+def parse_radii(value: int | str | list) -> list[int]:
+    """Parse a radius, a list of radii or a comma separated string of radii"""
+    if isinstance(value, int):
+        value = [value]
+    elif isinstance(value, str):
+        value = [v for v in value.replace(" ", "").split(",") if v]
+
+    try:
+        radii = sorted({int(v) for v in value})
+    except ValueError as err:
+        raise InvalidDistance from err
+
+    if not radii or radii[0] < 0:
+        raise InvalidDistance
+
+    return radii
+
+
+def validate_min_fuel(value: int) -> int:
+    """Validate a minimum fuel percentage"""
+    if not 0 <= value <= 100:
+        raise InvalidFuel
+    return value
+
+
 async def validate_config_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
     """Validate the user input for zone config"""
 
-    if data[CONF_RADIUS] < 0:
-        raise InvalidDistance
+    radii = parse_radii(data[CONF_RADIUS])
 
     zone_data = get_zone_by_name(hass, data[CONF_ZONE])
     if not zone_data:
         raise InvalidZone
     zone_id = zone_data["id"]
 
-    return {CONF_ZONE: zone_id, CONF_RADIUS: data[CONF_RADIUS]}
+    min_fuel = validate_min_fuel(data.get(CONF_MIN_FUEL, 0))
+
+    return {CONF_ZONE: zone_id, CONF_RADIUS: radii, CONF_MIN_FUEL: min_fuel}
 
 
 async def validate_tracker_config_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
@@ -53,6 +81,8 @@ async def validate_tracker_config_input(hass: HomeAssistant, data: dict) -> dict
     if data[CONF_SEARCH_VALUE] <= 0:
         raise InvalidDistance
 
+    validate_min_fuel(data.get(CONF_MIN_FUEL, 0))
+
     return data
 
 
@@ -62,6 +92,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step. Choose between Zone and Device Tracker."""
         return self.async_show_menu(
@@ -81,6 +117,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "cannot_connect"
             except InvalidDistance:
                 errors["dist"] = "Distance must be > 0"
+            except InvalidFuel:
+                errors[CONF_MIN_FUEL] = "fuel"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -105,6 +143,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "cannot_connect"
             except InvalidDistance:
                 errors["dist"] = "Value must be > 0"
+            except InvalidFuel:
+                errors[CONF_MIN_FUEL] = "fuel"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -123,11 +163,43 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
             ),
             vol.Required(CONF_SEARCH_VALUE, default=5): int,
+            vol.Optional(CONF_MIN_FUEL, default=0): int,
         })
 
         return self.async_show_form(step_id="tracker", data_schema=DATA_SCHEMA, errors=errors)
 
 
+class OptionsFlow(config_entries.OptionsFlow):
+    """Handle options for an existing EvoCarShare entry."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the search radii and minimum fuel of an entry."""
+        is_zone = CONF_ZONE in self._entry.data
+        errors = {}
+
+        if user_input is not None:
+            try:
+                options = {CONF_MIN_FUEL: validate_min_fuel(user_input[CONF_MIN_FUEL])}
+                if is_zone:
+                    options[CONF_RADIUS] = parse_radii(user_input[CONF_RADIUS])
+                return self.async_create_entry(title="", data=options)
+            except InvalidDistance:
+                errors[CONF_RADIUS] = "dist"
+            except InvalidFuel:
+                errors[CONF_MIN_FUEL] = "fuel"
+
+        schema = {}
+        if is_zone:
+            schema[vol.Required(CONF_RADIUS, default=", ".join(str(r) for r in get_radii(self._entry)))] = str
+        schema[vol.Required(CONF_MIN_FUEL, default=get_min_fuel(self._entry))] = int
+        DATA_SCHEMA = vol.Schema(schema)
+
+        return self.async_show_form(step_id="init", data_schema=DATA_SCHEMA, errors=errors)
+
+
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -138,3 +210,7 @@ class InvalidDistance(exceptions.HomeAssistantError):
 
 class InvalidZone(exceptions.HomeAssistantError):
     """Error to indicate zone could not be found"""
+
+
+class InvalidFuel(exceptions.HomeAssistantError):
+    """Error to indicate the fuel percentage is out of range"""
@@ -4,6 +4,7 @@ DOMAIN = "evocarshare"
 
 # DictKeys
 COORD = "coordinator"
+CONFIG = "config"
 LATITUDE = "latitude"
 LONGITUDE = "longitude"
 
@@ -13,6 +14,7 @@ CONF_RADIUS = "radius"
 CONF_TRACKER_ID = "tracker_id"
 CONF_SEARCH_MODE = "search_mode"
 CONF_SEARCH_VALUE = "search_value"
+CONF_MIN_FUEL = "min_fuel"
 
 SEARCH_MODE_RADIUS = "radius"
 SEARCH_MODE_COUNT = "count"
@@ -1,26 +1,54 @@
+import asyncio
 import logging
+import time
 from datetime import timedelta
 
 from aiohttp import ClientSession
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from evocarshare import CredentialBundle, EvoApi
+from evocarshare import CredentialBundle, EvoApi, GpsCoord
 
-from .const import API_CID, API_CS, API_K, DOMAIN
-from .helpers import deobscure
+from .const import API_CID, API_CS, API_K, CONFIG, DOMAIN
+from .helpers import deobscure, get_location, get_min_fuel
+from .history import HISTORY_RETENTION, FleetHistory, area_vehicles
+from .profiling import RefreshProfiler
+from .snapshot import FleetSnapshot, build_snapshot
 
 _LOGGER = logging.getLogger(__name__)
 
 EVO_UPDATE_INTERVAL = 60  # TODO: replace with configuarable variable
 
+# Number of vehicle/entry distance calculations above which the compute stage
+# is moved off the event loop. Tune using `loop_block_time` in the debug logs.
+EVO_OFFLOAD_THRESHOLD = 5000
 
-class EvoCarShareUpdateCoordinator(DataUpdateCoordinator[None]):
+
+class EvoCarShareUpdateCoordinator(DataUpdateCoordinator[FleetSnapshot]):
     def __init__(self, hass: HomeAssistant, client_session: ClientSession) -> None:
         creds = CredentialBundle(deobscure(API_K), deobscure(API_CID), deobscure(API_CS))
         self._api = EvoApi(client_session, creds)
         self._client_session = client_session
 
+        # Seconds spent on the event loop / in total by the last compute stage,
+        # the loop time includes history recording and notifying listeners
+        self.loop_block_time: float = 0.0
+        self.compute_time: float = 0.0
+        self._offloaded = False
+        # Set by a successful update until the end of the refresh it belongs to
+        self._fan_out_pending = False
+        self._ranked_entries = 0
+        self._ranked_vehicles = 0
+
+        self.history = FleetHistory(HISTORY_RETENTION, EVO_UPDATE_INTERVAL)
+
+        # Only set while a capture requested by the profile service is running
+        self._profiler: RefreshProfiler | None = None
+        self._profile_done: asyncio.Future[None] | None = None
+        # Held for a whole capture, up to and including writing the report
+        self._profile_lock = asyncio.Lock()
+
         super().__init__(
             hass,
             _LOGGER,
@@ -33,11 +61,168 @@ class EvoCarShareUpdateCoordinator(DataUpdateCoordinator[None]):
         """Return number of evos in close proximity."""
         return self._evo_count
 
-    async def _async_update_data(self):
-        """Fetch data from API endpoint."""
+    def _reference_points(self) -> dict[str, GpsCoord]:
+        """Resolve the current reference point of every loaded config entry."""
+        ref_points = {}
+        for entry_id, entry in self.hass.data[DOMAIN][CONFIG].items():
+            try:
+                location = get_location(self.hass, entry.data)
+            except KeyError:
+                _LOGGER.warning(f"Zone for entry {entry.title} no longer exists")
+                continue
+            if location is not None:
+                ref_points[entry_id] = location
+        return ref_points
+
+    async def _async_update_data(self) -> FleetSnapshot:
+        """Fetch data from API endpoint and compute per-entry rankings."""
 
         car_data = await self._api.get_vehicles()
-        if not car_data:
-            return []
+        vehicles = list(car_data) if car_data else []
+
+        start = time.perf_counter()
+        ref_points = self._reference_points()
+        entries = self.hass.data[DOMAIN][CONFIG]
+        min_fuel = {entry_id: get_min_fuel(entries[entry_id]) for entry_id in ref_points}
+        workload = len(vehicles) * len(ref_points)
+
+        # Snapshots are built inline while profiling: a second cProfile in the
+        # executor thread conflicts with the active one on Python 3.12+
+        self._offloaded = workload > EVO_OFFLOAD_THRESHOLD and self._profiler is None
+        self._ranked_entries = len(ref_points)
+        self._ranked_vehicles = len(vehicles)
+
+        if self._offloaded:
+            loop_time = time.perf_counter() - start
+            snapshot = await self.hass.async_add_executor_job(build_snapshot, vehicles, ref_points, min_fuel)
+            resumed = time.perf_counter()
+        else:
+            snapshot = build_snapshot(vehicles, ref_points, min_fuel)
+            loop_time = 0.0
+            resumed = start
+
+        self._record_history(snapshot, ref_points)
+
+        end = time.perf_counter()
+        self.compute_time = end - start
+        self.loop_block_time = loop_time + end - resumed
+        self._fan_out_pending = True
+
+        return snapshot
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, accounting the time spent on the event loop.
+
+        Only the fan-out following a successful update in the same refresh is
+        accounted, so the metrics always describe a single refresh.
+        """
+        if not self._fan_out_pending:
+            super().async_update_listeners()
+            return
+
+        self._fan_out_pending = False
+        start = time.perf_counter()
+        super().async_update_listeners()
+        self.loop_block_time += time.perf_counter() - start
+
+        _LOGGER.debug(
+            f"Computed {self._ranked_entries} rankings for {self._ranked_vehicles} vehicles "
+            f"(offloaded={self._offloaded}, "
+            f"loop_block_time={self.loop_block_time * 1000:.2f}ms, "
+            f"compute_time={self.compute_time * 1000:.2f}ms)"
+        )
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh data and notify listeners, under the profiler if one is active."""
+        profiler = self._profiler
+        if profiler is not None and profiler.complete:
+            profiler = None
+        elif profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError as err:
+                # Another profiler (e.g. HA's profiler integration) is active. The
+                # refresh must still run as it schedules the next one.
+                self._finish_profile(ProfilerUnavailable(err))
+                profiler = None
+
+        try:
+            return await super()._async_refresh(*args, **kwargs)
+        finally:
+            self._fan_out_pending = False
+            if profiler is not None:
+                profiler.disable()
+                if profiler.complete:
+                    self._finish_profile()
+
+    def _finish_profile(self, err: Exception | None = None) -> None:
+        """Wake up the running profile service call."""
+        if self._profile_done is None or self._profile_done.done():
+            return
+        if err is None:
+            self._profile_done.set_result(None)
+        else:
+            self._profile_done.set_exception(err)
+
+    async def async_profile(self, refreshes: int, top: int) -> dict:
+        """Profile the next refreshes and return a summary."""
+        if self._profile_lock.locked():
+            raise ProfileInProgress
+
+        async with self._profile_lock:
+            return await self._async_capture_profile(refreshes, top)
+
+    async def _async_capture_profile(self, refreshes: int, top: int) -> dict:
+        """Wait for the profiled refreshes, then write the report."""
+        profiler = RefreshProfiler(refreshes)
+        self._profile_done = self.hass.loop.create_future()
+        self._profiler = profiler
+        profiler.start()
+        try:
+            await asyncio.wait_for(self._profile_done, timeout=2 * refreshes * EVO_UPDATE_INTERVAL)
+        except asyncio.TimeoutError as err:
+            profiler.discard()
+            raise ProfileTimeout from err
+        except BaseException:
+            profiler.discard()
+            raise
+        finally:
+            self._profiler = None
+            self._profile_done = None
+
+        return await self.hass.async_add_executor_job(profiler.write_report, self.hass.config.path(), top)
+
+    def _record_history(self, snapshot: FleetSnapshot, ref_points: dict[str, GpsCoord]) -> None:
+        """Append the vehicles in each entry's area of interest to the history."""
+        entries = self.hass.data[DOMAIN][CONFIG]
+        self.history.retain(entries)
+
+        now = time.time()
+        for entry_id, ranking in snapshot.rankings.items():
+            # The entry may have been unloaded while the snapshot was being built
+            if (entry := entries.get(entry_id)) is None:
+                continue
+            vehicles, total = area_vehicles(entry, ranking)
+            self.history.record(now, entry_id, ref_points[entry_id], vehicles, total)
+
+
+class ProfileInProgress(HomeAssistantError):
+    """Error to indicate a profile is already being captured"""
+
+    def __init__(self) -> None:
+        super().__init__("A profile is already being captured")
+
+
+class ProfilerUnavailable(HomeAssistantError):
+    """Error to indicate the profiler could not be enabled"""
+
+    def __init__(self, err: Exception) -> None:
+        super().__init__(f"Unable to enable the profiler: {err}")
+
+
+class ProfileTimeout(HomeAssistantError):
+    """Error to indicate the refreshes to profile did not happen in time"""
 
-        return list(car_data)
+    def __init__(self) -> None:
+        super().__init__("Timed out waiting for refreshes to profile")
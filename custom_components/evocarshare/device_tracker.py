@@ -22,7 +22,7 @@ from .const import (
     SEARCH_MODE_RADIUS,
 )
 from .coordinator import EvoCarShareUpdateCoordinator
-from .helpers import get_location
+from .helpers import get_min_fuel
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -118,31 +118,12 @@ class EvoVehicleTracker(CoordinatorEntity, TrackerEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data = self.coordinator.data
-        if not data:
-            self._vehicle = None
-            self._distance = None
-            self.async_write_ha_state()
-            return
-
-        target_location = get_location(self.hass, self.config_entry.data)
-        if not target_location:
-            self._vehicle = None
-            self._distance = None
-            self.async_write_ha_state()
-            return
-
-        # Calculate distances locally without modifying shared vehicle objects
-        vehicles_with_dist = []
-        for v in data:
-            dist = v.location.distanceTo(target_location)
-            vehicles_with_dist.append((v, dist))
-
-        # Sort by distance
-        vehicles_with_dist.sort(key=lambda x: x[1])
+        snapshot = self.coordinator.data
+        min_fuel = get_min_fuel(self.config_entry)
+        ranking = snapshot.ranking(self.config_entry.entry_id, min_fuel) if snapshot is not None else None
 
-        if len(vehicles_with_dist) >= self._index:
-            self._vehicle, self._distance = vehicles_with_dist[self._index - 1]
+        if ranking is not None and (ranked := ranking.nearest(self._index)) is not None:
+            self._vehicle, self._distance = ranked
         else:
             self._vehicle = None
             self._distance = None
@@ -162,22 +143,18 @@ class EvoDynamicTrackerManager:
 
     @callback
     def update_entities(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.data
+        if snapshot is None or not snapshot.vehicles:
             return
 
-        target_location = get_location(self.hass, self.entry.data)
-        if not target_location:
+        ranking = snapshot.ranking(self.entry.entry_id, get_min_fuel(self.entry))
+        if ranking is None:
             return
 
         radius = self.entry.data.get(CONF_SEARCH_VALUE, 500)
 
         # Find vehicles in radius
-        vehicles_in_radius = []
-        for v in data:
-             dist = v.location.distanceTo(target_location)
-             if dist <= radius:
-                 vehicles_in_radius.append((v, dist))
+        vehicles_in_radius = ranking.within(radius)
 
         # Create entities for new vehicles
         new_entities = []
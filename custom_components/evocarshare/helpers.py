@@ -1,11 +1,12 @@
 from base64 import b64decode, b64encode
 from zlib import compress, decompress
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from evocarshare import GpsCoord
 
-from .const import CONF_TRACKER_ID, CONF_ZONE, LATITUDE, LONGITUDE
+from .const import CONF_MIN_FUEL, CONF_RADIUS, CONF_TRACKER_ID, CONF_ZONE, LATITUDE, LONGITUDE
 
 
 def get_zone_config(hass: HomeAssistant):
@@ -51,6 +52,20 @@ def get_location(hass: HomeAssistant, config_data: dict) -> GpsCoord | None:
     return None
 
 
+def get_radii(entry: ConfigEntry) -> list[int]:
+    """Return the sorted search radii of a zone entry.
+
+    Older entries store a single radius, newer entries a list of rings.
+    """
+    radius = entry.options.get(CONF_RADIUS, entry.data[CONF_RADIUS])
+    return sorted(radius) if isinstance(radius, list) else [radius]
+
+
+def get_min_fuel(entry: ConfigEntry) -> int:
+    """Return the minimum fuel percentage a vehicle needs to be considered."""
+    return entry.options.get(CONF_MIN_FUEL, entry.data.get(CONF_MIN_FUEL, 0))
+
+
 def obscure(s: str) -> str:
     return b64encode(compress(bytes(s, "utf8")))
 
@@ -0,0 +1,195 @@
+"""Rolling, memory-compact history of fleet positions per area of interest.
+
+Each refresh appends one frame per configured entry. A frame holds the plates
+near the entry's reference point and their positions, delta-encoded against
+that reference point:
+
+- plates are interned to small integer ids (``array("H")``, 2 bytes each)
+- latitude/longitude are stored as offsets from the frame's centre in units
+  of 1e-5 degrees (~1.1 m) as ``array("h")`` (2 bytes each); vehicles further
+  than ~0.32 degrees from the centre are not recorded
+- only the HISTORY_MAX_VEHICLES nearest vehicles are kept; each frame records
+  how many vehicles were in the area so truncation can be reported
+
+Frames older than HISTORY_RETENTION are pruned, and refreshes arriving sooner
+than 90% of the update interval after the previous frame (e.g. manual updates)
+are not recorded, so at most 67 frames are kept per area per hour with the
+default 60s interval. At the worst case of 64 vehicles a frame costs ~0.8 KB,
+so one hour of retention costs at most ~53 KB per area (~320 KB per area with
+the default 6 hours). Plates are reference counted and dropped once no frame
+refers to them, so the plate table only holds plates seen within the retention
+window (at most 65536).
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntry
+
+from evocarshare import GpsCoord, Vehicle
+
+from .const import (
+    CONF_SEARCH_MODE,
+    CONF_SEARCH_VALUE,
+    CONF_ZONE,
+    LATITUDE,
+    LONGITUDE,
+    SEARCH_MODE_COUNT,
+)
+from .helpers import get_radii
+from .snapshot import EntryRanking
+
+HISTORY_RETENTION = timedelta(hours=6)
+HISTORY_MAX_VEHICLES = 64
+
+_COORD_SCALE = 100_000
+_OFFSET_LIMIT = 32_767
+_MAX_PLATES = 65_536
+_MIN_SPACING_FACTOR = 0.9
+
+
+class _Frame:
+    """Positions of the vehicles in one area at one point in time."""
+
+    __slots__ = ("center_lat", "center_lon", "d_lat", "d_lon", "plates", "timestamp", "total")
+
+    def __init__(self, timestamp: float, center: GpsCoord, total: int) -> None:
+        self.timestamp = timestamp
+        self.total = total
+        self.center_lat = center.lat
+        self.center_lon = center.lon
+        self.plates = array("H")
+        self.d_lat = array("h")
+        self.d_lon = array("h")
+
+
+class PlateTable:
+    """Reference counted mapping between plates and compact integer ids."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._plates: list[str | None] = []
+        self._refs: list[int] = []
+        self._free: list[int] = []
+
+    def acquire(self, plate: str) -> int | None:
+        """Return the id of a plate and add a reference to it.
+
+        Returns None if all ids are in use.
+        """
+        if (plate_id := self._ids.get(plate)) is None:
+            if self._free:
+                plate_id = self._free.pop()
+            elif len(self._plates) < _MAX_PLATES:
+                plate_id = len(self._plates)
+                self._plates.append(None)
+                self._refs.append(0)
+            else:
+                return None
+            plate = sys.intern(plate)
+            self._ids[plate] = plate_id
+            self._plates[plate_id] = plate
+        self._refs[plate_id] += 1
+        return plate_id
+
+    def release(self, plate_ids: Iterable[int]) -> None:
+        """Drop a reference to each id, freeing ids which are no longer used."""
+        for plate_id in plate_ids:
+            self._refs[plate_id] -= 1
+            if self._refs[plate_id] == 0:
+                del self._ids[self._plates[plate_id]]
+                self._plates[plate_id] = None
+                self._free.append(plate_id)
+
+    def plate(self, plate_id: int) -> str:
+        return self._plates[plate_id]
+
+
+def area_vehicles(entry: ConfigEntry, ranking: EntryRanking) -> tuple[Iterable[Vehicle], int]:
+    """Return the nearest vehicles inside an entry's area of interest.
+
+    At most HISTORY_MAX_VEHICLES are returned, along with the number of
+    vehicles in the area.
+    """
+    entry_data = entry.data
+    if CONF_ZONE in entry_data:
+        vehicles = [v for v, _ in ranking.within(get_radii(entry)[-1])]
+    elif entry_data.get(CONF_SEARCH_MODE, SEARCH_MODE_COUNT) == SEARCH_MODE_COUNT:
+        vehicles = ranking.vehicles[: entry_data.get(CONF_SEARCH_VALUE, 5)]
+    else:
+        vehicles = [v for v, _ in ranking.within(entry_data.get(CONF_SEARCH_VALUE, 500))]
+    return vehicles[:HISTORY_MAX_VEHICLES], len(vehicles)
+
+
+class FleetHistory:
+    """Time-bounded ring buffer of frames for each area of interest."""
+
+    def __init__(self, retention: timedelta, update_interval: float) -> None:
+        self._retention = retention.total_seconds()
+        self._min_spacing = update_interval * _MIN_SPACING_FACTOR
+        self._max_frames = int(self._retention // self._min_spacing) + 1
+        self._plates = PlateTable()
+        self._areas: dict[str, deque[_Frame]] = {}
+
+    def record(
+        self,
+        timestamp: float,
+        area_id: str,
+        center: GpsCoord,
+        vehicles: Iterable[Vehicle],
+        total: int,
+    ) -> None:
+        """Append a frame for an area and evict frames outside the retention."""
+        frames = self._areas.setdefault(area_id, deque())
+        if frames and timestamp - frames[-1].timestamp < self._min_spacing:
+            return
+
+        frame = _Frame(timestamp, center, total)
+        for v in vehicles:
+            d_lat = round((v.location.lat - center.lat) * _COORD_SCALE)
+            d_lon = round((v.location.lon - center.lon) * _COORD_SCALE)
+            if abs(d_lat) > _OFFSET_LIMIT or abs(d_lon) > _OFFSET_LIMIT:
+                continue
+            if (plate_id := self._plates.acquire(v.plate)) is None:
+                continue
+            frame.plates.append(plate_id)
+            frame.d_lat.append(d_lat)
+            frame.d_lon.append(d_lon)
+        frames.append(frame)
+
+        cutoff = timestamp - self._retention
+        while frames[0].timestamp < cutoff or len(frames) > self._max_frames:
+            self._plates.release(frames.popleft().plates)
+
+    def retain(self, area_ids: Iterable[str]) -> None:
+        """Drop the history of areas which are no longer configured."""
+        keep = set(area_ids)
+        for area_id in [a for a in self._areas if a not in keep]:
+            for frame in self._areas.pop(area_id):
+                self._plates.release(frame.plates)
+
+    def timeline(self, area_id: str, start: float, end: float) -> list[dict]:
+        """Decode the frames of an area recorded between start and end."""
+        timeline = []
+        for frame in self._areas.get(area_id, ()):
+            if not start <= frame.timestamp <= end:
+                continue
+            timeline.append({
+                "timestamp": frame.timestamp,
+                "total": frame.total,
+                "truncated": frame.total > len(frame.plates),
+                "vehicles": [
+                    {
+                        "plate": self._plates.plate(plate_id),
+                        LATITUDE: round(frame.center_lat + d_lat / _COORD_SCALE, 5),
+                        LONGITUDE: round(frame.center_lon + d_lon / _COORD_SCALE, 5),
+                    }
+                    for plate_id, d_lat, d_lon in zip(frame.plates, frame.d_lat, frame.d_lon)
+                ],
+            })
+        return timeline
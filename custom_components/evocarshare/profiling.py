@@ -0,0 +1,111 @@
+"""On-demand cProfile/tracemalloc capture of coordinator refreshes.
+
+The coordinator only holds a RefreshProfiler while a capture requested through
+the `evocarshare.profile` service is running, so refreshes are untouched
+otherwise. A capture waits for the next N refreshes (scheduled or requested by
+anything else) rather than forcing extra API calls. While enabled the profile
+covers the whole refresh: the API fetch, snapshot building (which is not
+offloaded to the executor during a capture) and every listener, i.e. the
+platforms' `_handle_coordinator_update` and `update_entities`. Other event loop
+work interleaving with the API fetch may also show up in the results.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+PROFILE_FILE_PREFIX = "evocarshare_profile"
+
+
+class RefreshProfiler:
+    """Collects profiling data across a number of refreshes."""
+
+    def __init__(self, refreshes: int) -> None:
+        self._target = refreshes
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._owns_tracemalloc = False
+        self._memory: tracemalloc.Snapshot | None = None
+        self.refreshes = 0
+
+    def start(self) -> None:
+        """Start tracing memory allocations, unless somebody already is."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def discard(self) -> None:
+        """Stop tracing memory allocations if we started it."""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @property
+    def complete(self) -> bool:
+        """Return whether the requested number of refreshes was profiled."""
+        return self.refreshes >= self._target
+
+    def enable(self) -> None:
+        """Enable the profiler for a refresh; nested refreshes share it."""
+        if self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+
+    def disable(self) -> None:
+        if self._depth == 1:
+            self._profile.disable()
+            self.refreshes += 1
+        self._depth -= 1
+
+    def write_report(self, config_dir: str, top: int) -> dict[str, Any]:
+        """Write the results to config_dir and return a top-N summary.
+
+        Takes the tracemalloc snapshot first, so should run in the executor.
+        """
+        self._memory = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        self.discard()
+
+        stats = pstats.Stats(self._profile)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+
+        base = os.path.join(config_dir, f"{PROFILE_FILE_PREFIX}_{int(time.time())}")
+        profile_file = f"{base}.prof"
+        memory_file = f"{base}.tracemalloc.txt"
+
+        stats.dump_stats(profile_file)
+        memory_stats = self._memory.statistics("lineno") if self._memory else []
+        with open(memory_file, "w", encoding="utf-8") as f:
+            f.writelines(f"{stat}\n" for stat in memory_stats)
+
+        functions = []
+        for func in stats.fcn_list[:top]:
+            _, calls, total_time, cumulative_time, _ = stats.stats[func]
+            functions.append({
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            })
+
+        return {
+            "refreshes": self.refreshes,
+            "profile_file": profile_file,
+            "memory_file": memory_file,
+            "total_time": round(stats.total_tt, 6),
+            "functions": functions,
+            "memory": [
+                {
+                    "location": str(stat.traceback),
+                    "size_kib": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in memory_stats[:top]
+            ],
+        }
@@ -11,24 +11,20 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory, UnitOfLength
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from evocarshare import GpsCoord, Vehicle
-
 from .const import (
     ATTR_CLOSEST,
     ATTR_COUNT,
-    CONF_RADIUS,
     CONF_ZONE,
-    CONF_TRACKER_ID,
     COORD,
     DOMAIN,
-    LATITUDE,
-    LONGITUDE,
 )
 from .coordinator import EvoCarShareUpdateCoordinator
-from .helpers import get_zone_config, get_location
+from .helpers import get_min_fuel, get_radii
+from .snapshot import EntryRanking
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,8 +61,14 @@ async def async_setup_entry(
     # However, if the user configures a tracker, the old code might break if we don't handle it.
 
     if CONF_ZONE in entry.data:
+        radii = get_radii(entry)
+        count_sensors = [
+            EvoProximityCountSensor(coordinator, entry, COUNT_SENSOR, radius, primary=i == 0)
+            for i, radius in enumerate(radii)
+        ]
+        remove_stale_rings(hass, entry, {sensor.unique_id for sensor in count_sensors})
         async_add_entities([
-            EvoProximityCountSensor(coordinator, entry, COUNT_SENSOR),
+            *count_sensors,
             EvoClosestDistanceSensor(coordinator, entry, CLOSEST_SENSOR),
         ])
 
@@ -81,7 +83,11 @@ async def async_setup_entry(
 
 
 class EvoProximityCountSensor(CoordinatorEntity, SensorEntity):
-    """Number of Evo's within configured range."""
+    """Number of Evo's within configured range.
+
+    The smallest ring keeps the original naming, any further rings get one
+    sensor per radius.
+    """
 
     _attr_state_class = SensorStateClass.MEASUREMENT
 
@@ -90,33 +96,26 @@ class EvoProximityCountSensor(CoordinatorEntity, SensorEntity):
         coordinator: EvoCarShareUpdateCoordinator,
         entry: ConfigEntry,
         description: SensorEntityDescription,
+        radius: int,
+        primary: bool = True,
     ) -> None:
         super().__init__(coordinator)
         self.config_entry = entry
         self.entity_description = description
-        self._attr_unique_id = f"{description.key}"
+        self._radius = radius
         self._attr_name = f"{entry.data[CONF_ZONE].capitalize()} Evo Count"
         self._attr_unique_id = f"{entry.data[CONF_ZONE]}_evo_{ATTR_COUNT}"
+        if not primary:
+            self._attr_name += f" {radius}m"
+            self._attr_unique_id += f"_{radius}m"
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data = self.coordinator.data
-
-        if data:
-            zone_id = self.config_entry.data[CONF_ZONE]
-            target_zone = get_zone_config(self.hass)[zone_id]
-            target_ref_point = GpsCoord(
-                target_zone[LATITUDE],
-                target_zone[LONGITUDE],
-            )
-            proximity_distance = self.config_entry.data[CONF_RADIUS]
-
-            def close(v: Vehicle) -> bool:
-                return v.location.distanceTo(target_ref_point) < proximity_distance
-
-            close_vehicles = list(filter(close, data))
-            self._attr_native_value = len(close_vehicles)
+        ranking = entry_ranking(self.coordinator, self.config_entry)
+
+        if ranking is not None:
+            self._attr_native_value = ranking.count_within(self._radius)
             self.async_write_ha_state()
 
             _LOGGER.debug(f"ValueUpdate: {self._attr_unique_id}:{self._attr_native_value}")
@@ -142,26 +141,35 @@ class EvoClosestDistanceSensor(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data = self.coordinator.data
+        ranking = entry_ranking(self.coordinator, self.config_entry)
 
-        if not data:
+        if ranking is None:
             return
 
-        target_ref_point = zone_gps(self.hass, self.config_entry.data[CONF_ZONE])
-
-        def dist(v: Vehicle) -> bool:
-            return v.location.distanceTo(target_ref_point)
-
-        self._attr_native_value = int(min([dist(v) for v in data]))
+        # No vehicle may meet the entry's minimum fuel level
+        closest = ranking.closest
+        self._attr_native_value = int(closest) if closest is not None else None
         self.async_write_ha_state()
 
         _LOGGER.debug(f"ValueUpdate: {self._attr_unique_id}:{self._attr_native_value}")
 
 
-def zone_gps(hass, zone_id: str) -> GpsCoord:
-    """Returns GPSCoord for a given zone_id"""
-    target_zone = get_zone_config(hass)[zone_id]
-    return GpsCoord(
-        target_zone[LATITUDE],
-        target_zone[LONGITUDE],
-    )
+def remove_stale_rings(hass: HomeAssistant, entry: ConfigEntry, unique_ids: set[str]) -> None:
+    """Remove ring sensors of radii which are no longer configured"""
+    registry = er.async_get(hass)
+    ring_prefix = f"{entry.data[CONF_ZONE]}_evo_{ATTR_COUNT}_"
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if (
+            entity.domain == "sensor"
+            and entity.unique_id.startswith(ring_prefix)
+            and entity.unique_id not in unique_ids
+        ):
+            registry.async_remove(entity.entity_id)
+
+
+def entry_ranking(coordinator: EvoCarShareUpdateCoordinator, entry: ConfigEntry) -> EntryRanking | None:
+    """Returns the precomputed ranking for an entry, if any vehicles were found"""
+    snapshot = coordinator.data
+    if snapshot is None or not snapshot.vehicles:
+        return None
+    return snapshot.ranking(entry.entry_id, get_min_fuel(entry))
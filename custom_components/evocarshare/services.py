@@ -0,0 +1,88 @@
+"""Services for the EvoCarShare integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import CONFIG, COORD, DOMAIN
+from .coordinator import EvoCarShareUpdateCoordinator
+from .history import HISTORY_RETENTION
+
+SERVICE_GET_TIMELINE = "get_timeline"
+SERVICE_PROFILE = "profile"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_REFRESHES = "refreshes"
+ATTR_TOP = "top"
+
+TIMELINE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_REFRESHES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+    vol.Optional(ATTR_TOP, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+})
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_get_timeline(call: ServiceCall) -> ServiceResponse:
+        """Return the recorded vehicle positions for an area."""
+        coordinator: EvoCarShareUpdateCoordinator = hass.data[DOMAIN][COORD]
+
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        if entry_id not in hass.data[DOMAIN][CONFIG]:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unknown_entry",
+                translation_placeholders={ATTR_CONFIG_ENTRY_ID: entry_id},
+            )
+
+        end = dt_util.as_utc(call.data.get(ATTR_END, dt_util.utcnow()))
+        start = dt_util.as_utc(call.data.get(ATTR_START, end - HISTORY_RETENTION))
+
+        timeline = coordinator.history.timeline(
+            entry_id,
+            start.timestamp(),
+            end.timestamp(),
+        )
+        for frame in timeline:
+            frame["timestamp"] = dt_util.utc_from_timestamp(frame["timestamp"]).isoformat()
+
+        return {"timeline": timeline}
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next refreshes and write the results to the config directory."""
+        coordinator: EvoCarShareUpdateCoordinator = hass.data[DOMAIN][COORD]
+        return await coordinator.async_profile(call.data[ATTR_REFRESHES], call.data[ATTR_TOP])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TIMELINE,
+        async_get_timeline,
+        schema=TIMELINE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration's services."""
+    hass.services.async_remove(DOMAIN, SERVICE_GET_TIMELINE)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
@@ -0,0 +1,106 @@
+"""Per-refresh computation of vehicle rankings for each configured entry.
+
+Everything in this module is free of Home Assistant state so it can be run
+either inline on the event loop or inside an executor thread.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from evocarshare import GpsCoord, Vehicle
+
+
+@dataclass(frozen=True)
+class EntryRanking:
+    """Vehicles ordered by distance from an entry's reference point.
+
+    Views restricted to a minimum fuel level are precomputed per refresh for
+    the thresholds in use, so entities only ever bisect or index a ranking.
+    """
+
+    vehicles: tuple[Vehicle, ...] = ()
+    distances: tuple[float, ...] = ()
+    fuel_views: Mapping[int, EntryRanking] = field(default_factory=lambda: MappingProxyType({}))
+
+    def with_min_fuel(self, min_fuel: int) -> EntryRanking:
+        """Return the ranking of vehicles with at least min_fuel percent fuel."""
+        if not min_fuel:
+            return self
+        if (view := self.fuel_views.get(min_fuel)) is not None:
+            return view
+        return filter_by_fuel(self, min_fuel)
+
+    @property
+    def closest(self) -> float | None:
+        """Return the distance to the closest vehicle."""
+        return self.distances[0] if self.distances else None
+
+    def nearest(self, index: int) -> tuple[Vehicle, float] | None:
+        """Return the vehicle and distance at a 1-based rank."""
+        if 0 < index <= len(self.vehicles):
+            return self.vehicles[index - 1], self.distances[index - 1]
+        return None
+
+    def count_within(self, radius: float) -> int:
+        """Return the number of vehicles strictly closer than radius."""
+        return bisect_left(self.distances, radius)
+
+    def within(self, radius: float) -> tuple[tuple[Vehicle, float], ...]:
+        """Return (vehicle, distance) pairs no further than radius."""
+        end = bisect_right(self.distances, radius)
+        return tuple(zip(self.vehicles[:end], self.distances[:end]))
+
+
+@dataclass(frozen=True)
+class FleetSnapshot:
+    """Immutable result of a single coordinator refresh."""
+
+    vehicles: tuple[Vehicle, ...] = ()
+    rankings: Mapping[str, EntryRanking] = field(default_factory=lambda: MappingProxyType({}))
+
+    def ranking(self, entry_id: str, min_fuel: int = 0) -> EntryRanking | None:
+        """Return the ranking for a config entry, if it was computed."""
+        ranking = self.rankings.get(entry_id)
+        return ranking.with_min_fuel(min_fuel) if ranking is not None else None
+
+
+def rank_vehicles(vehicles: tuple[Vehicle, ...], ref_point: GpsCoord) -> EntryRanking:
+    """Sort vehicles by distance from ref_point."""
+    ranked = sorted(((v.location.distanceTo(ref_point), v) for v in vehicles), key=lambda x: x[0])
+    return EntryRanking(
+        vehicles=tuple(v for _, v in ranked),
+        distances=tuple(d for d, _ in ranked),
+    )
+
+
+def filter_by_fuel(ranking: EntryRanking, min_fuel: int) -> EntryRanking:
+    """Restrict a ranking to vehicles with at least min_fuel, keeping the order."""
+    kept = [(v, d) for v, d in zip(ranking.vehicles, ranking.distances) if (v.fuel or 0) >= min_fuel]
+    return EntryRanking(
+        vehicles=tuple(v for v, _ in kept),
+        distances=tuple(d for _, d in kept),
+    )
+
+
+def build_snapshot(
+    vehicles: list[Vehicle],
+    ref_points: Mapping[str, GpsCoord],
+    min_fuel: Mapping[str, int] | None = None,
+) -> FleetSnapshot:
+    """Compute rankings for every entry with a known reference point."""
+    fleet = tuple(vehicles)
+    min_fuel = min_fuel or {}
+
+    rankings = {}
+    for entry_id, ref_point in ref_points.items():
+        ranking = rank_vehicles(fleet, ref_point)
+        if threshold := min_fuel.get(entry_id):
+            views = MappingProxyType({threshold: filter_by_fuel(ranking, threshold)})
+            ranking = EntryRanking(ranking.vehicles, ranking.distances, views)
+        rankings[entry_id] = ranking
+
+    return FleetSnapshot(vehicles=fleet, rankings=MappingProxyType(rankings))